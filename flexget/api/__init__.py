@@ -1,4 +1,4 @@
-from .app import APIClient, APIResource, api, api_app  # noqa
+from .app import APIClient, APIResource, SessionlessAPIResource, api, api_app  # noqa
 from .core import (  # noqa
     authentication,
     cached,
@@ -1,9 +1,10 @@
-import json
 import os
 import re
+import threading
 from collections import deque
 from contextlib import suppress
 from functools import partial, wraps
+from operator import attrgetter
 from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Tuple, Union
 
 from flask import Flask, Request, Response, jsonify, make_response, request
@@ -12,14 +13,22 @@ from flask_cors import CORS
 from flask_restx import Api as RestxAPI
 from flask_restx import Model, Resource
 from flask_restx.reqparse import RequestParser
-from jsonschema import RefResolutionError
+from jsonschema import Draft4Validator, RefResolutionError
 from jsonschema.exceptions import ValidationError as SchemaValidationError
 from loguru import logger
 from sqlalchemy.orm import Session
 from werkzeug.http import generate_etag
 
 from flexget import manager
-from flexget.config_schema import format_checker, process_config
+from flexget.config_schema import (
+    ConfigValidationError,
+    format_checker,
+    get_validator,
+    process_config,
+    resolve_ref,
+    schema_paths,
+)
+from flexget.utils import json
 from flexget.utils.database import with_session
 from flexget.webserver import User
 
@@ -54,7 +63,7 @@ class APIClient:
         self.app = api_app.test_client()
 
     def __getattr__(self, item: str) -> 'APIEndpoint':
-        return APIEndpoint('/api/' + item, self.get_endpoint)
+        return APIEndpoint(('', 'api', item), self.get_endpoint)
 
     def get_endpoint(self, url: str, data=None, method: str = None):
         if method is None:
@@ -63,7 +72,7 @@ class APIClient:
         response = self.app.open(
             url, data=data, follow_redirects=True, method=method, headers=auth_header
         )
-        result = json.loads(response.get_data(as_text=True))
+        result = json.loads(response.get_data())
         # TODO: Proper exceptions
         if 200 > response.status_code >= 300:
             raise Exception(result['error'])
@@ -71,15 +80,21 @@ class APIClient:
 
 
 class APIEndpoint:
-    def __init__(self, endpoint: str, caller: Callable) -> None:
-        self.endpoint = endpoint
+    """Collects the path segments of an endpoint, the url is only joined once the endpoint is called."""
+
+    def __init__(self, segments: Tuple[str, ...], caller: Callable) -> None:
+        self.segments = segments
         self.caller = caller
 
     def __getattr__(self, item):
-        return self.__class__(self.endpoint + '/' + item, self.caller)
+        return self.__class__(self.segments + (item,), self.caller)
 
     __getitem__ = __getattr__
 
+    @property
+    def endpoint(self) -> str:
+        return '/'.join(self.segments)
+
     def __call__(self, data=None, method: str = None):
         return self.caller(self.endpoint, data=data, method=method)
 
@@ -106,6 +121,62 @@ class APIResource(Resource):
         super().__init__(api, *args, **kwargs)
 
 
+class SessionlessAPIResource(APIResource):
+    """
+    Base for resources which never use the database.
+
+    Their methods are not given a `session`, so requests to them don't create one.
+    """
+
+    method_decorators = [api_version]
+
+
+class CompiledSchema:
+    """
+    A json schema validator which is built once and shared between requests.
+
+    The jsonschema ref resolver keeps track of its resolution scope on a stack, so only one thread may validate
+    with it at a time.
+    """
+
+    def __init__(self, schema: dict, set_defaults: bool = False) -> None:
+        self.validator = get_validator(schema, set_defaults=set_defaults)
+        self._lock = threading.Lock()
+
+    def process(self, data) -> List[ConfigValidationError]:
+        with self._lock:
+            return process_config(data, validator=self.validator)
+
+    def preload(self, resolved_refs: Dict[str, dict]) -> None:
+        """Checks the schema, and fills the ref resolver's cache with already resolved `resolved_refs`."""
+        # Checked with the plain draft 4 validator, a defaults filling one would write meta schema defaults into it
+        Draft4Validator.check_schema(self.validator.schema)
+        with self._lock:
+            self.validator.resolver.store.update(resolved_refs)
+
+
+# Keyed by model id rather than stored on the model, as restx deep copies models into the api docs
+_compiled_schemas: Dict[Tuple[int, bool], CompiledSchema] = {}
+
+
+def compiled_schema(model: Model, set_defaults: bool = False) -> CompiledSchema:
+    """Returns the :class:`CompiledSchema` for `model`, building it the first time it is requested."""
+    key = (id(model), set_defaults)
+    if key not in _compiled_schemas:
+        _compiled_schemas[key] = CompiledSchema(model.__schema__, set_defaults=set_defaults)
+    return _compiled_schemas[key]
+
+
+def compile_schemas() -> None:
+    """
+    Resolves every registered schema path up front and hands them to the request validators, so the first request
+    to each endpoint does not have to resolve the refs in its schema.
+    """
+    resolved_refs = {path: resolve_ref(path) for path in schema_paths}
+    for compiled in _compiled_schemas.values():
+        compiled.preload(resolved_refs)
+
+
 class API(RestxAPI):
     """
     Extends a flask restx :class:`flask_restx.Api` with:
@@ -125,14 +196,17 @@ class API(RestxAPI):
         """
 
         def decorator(func):
+            compiled = (
+                CompiledSchema(schema_override) if schema_override else compiled_schema(model)
+            )
+
             @api.expect((model, description))
             @api.response(ValidationError)
             @wraps(func)
             def wrapper(*args, **kwargs):
                 payload = request.json
                 try:
-                    schema = schema_override if schema_override else model.__schema__
-                    errors = process_config(config=payload, schema=schema, set_defaults=False)
+                    errors = compiled.process(payload)
 
                     if errors:
                         raise ValidationError(errors)
@@ -241,8 +315,10 @@ class APIError(Exception):
         self.payload = payload
 
     def to_dict(self):
-        rv = self.payload or {}
-        rv.update(status_code=self.status_code, message=self.message, status=self.status)
+        rv = {'status_code': self.status_code, 'message': self.message, 'status': self.status}
+        if self.payload:
+            # Copy the payload rather than updating it, it may still be used by the caller
+            rv = {**self.payload, **rv}
         return rv
 
     @classmethod
@@ -325,6 +401,7 @@ class ValidationError(APIError):
         'schema_path',
         'parent',
     )
+    _verror_getter = attrgetter(*verror_attrs)
 
     def __init__(
         self, validation_errors: List[SchemaValidationError], message: str = 'validation error'
@@ -335,13 +412,10 @@ class ValidationError(APIError):
         super().__init__(message, payload=payload)
 
     def _verror_to_dict(self, error: SchemaValidationError) -> Mapping[str, Union[str, list]]:
-        error_dict: Dict[str, Union[str, list]] = {}
-        for attr in self.verror_attrs:
-            if isinstance(getattr(error, attr), deque):
-                error_dict[attr] = list(getattr(error, attr))
-            else:
-                error_dict[attr] = str(getattr(error, attr))
-        return error_dict
+        return {
+            attr: list(value) if type(value) is deque else str(value)
+            for attr, value in zip(self.verror_attrs, self._verror_getter(error))
+        }
 
 
 empty_response = api.schema_model('empty', {'type': 'object'})
@@ -1,8 +1,7 @@
 from flask import Response, jsonify, request
 from jsonschema import RefResolutionError
-from sqlalchemy.orm import Session
 
-from flexget.api import APIResource, api
+from flexget.api import SessionlessAPIResource, api
 from flexget.api.app import NotFoundError
 from flexget.config_schema import resolve_ref, schema_paths
 
@@ -38,9 +37,9 @@ def rewrite_refs(schema, base_url: str):
 
 
 @schema_api.route('/')
-class SchemaAllAPI(APIResource):
+class SchemaAllAPI(SessionlessAPIResource):
     @api.response(200, model=schema_api_list)
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """List all schema definitions"""
         schemas = []
         for path in schema_paths:
@@ -53,9 +52,9 @@ class SchemaAllAPI(APIResource):
 @schema_api.route('/<path:path>/')
 @api.doc(params={'path': 'Path of schema'})
 @api.response(NotFoundError)
-class SchemaAPI(APIResource):
+class SchemaAPI(SessionlessAPIResource):
     @api.response(200, model=schema_api_list)
-    def get(self, path: str, session: Session = None) -> Response:
+    def get(self, path: str) -> Response:
         """Get schema definition"""
         try:
             schema = resolve_ref(request.full_path)
@@ -32,11 +32,10 @@ from pyparsing import (
     printables,
     restOfLine,
 )
-from sqlalchemy.orm import Session
 from yaml.error import MarkedYAMLError, YAMLError
 
 from flexget._version import __version__
-from flexget.api import APIResource, api
+from flexget.api import SessionlessAPIResource, api
 from flexget.api.app import APIError, BadRequest
 from flexget.api.app import __version__ as __api_version__
 from flexget.api.app import (
@@ -129,12 +128,12 @@ crash_logs_schema = api.schema_model('server.crash_logs', ObjectsContainer.crash
 
 
 @server_api.route('/manage/')
-class ServerReloadAPI(APIResource):
+class ServerReloadAPI(SessionlessAPIResource):
     @api.validate(server_manage_schema)
     @api.response(501, model=yaml_error_schema, description='YAML syntax error')
     @api.response(502, model=config_validation_schema, description='Config validation error')
     @api.response(200, model=base_message_schema)
-    def post(self, session: Session = None) -> Response:
+    def post(self) -> Response:
         """Manage server operations"""
         data = request.json
         if data['operation'] == 'reload':
@@ -167,30 +166,30 @@ class ServerReloadAPI(APIResource):
 
 
 @server_api.route('/pid/')
-class ServerPIDAPI(APIResource):
+class ServerPIDAPI(SessionlessAPIResource):
     @api.response(200, description='Reloaded config', model=pid_schema)
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """Get server PID"""
         return jsonify({'pid': os.getpid()})
 
 
 @server_api.route('/config/')
-class ServerConfigAPI(APIResource):
+class ServerConfigAPI(SessionlessAPIResource):
     @etag
     @api.response(200, description='Flexget config', model=empty_response)
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """Get Flexget Config in JSON form"""
         return jsonify(self.manager.config)
 
 
 @server_api.route('/raw_config/')
-class ServerRawConfigAPI(APIResource):
+class ServerRawConfigAPI(SessionlessAPIResource):
     @etag
     @api.doc(description='Return config file encoded in Base64')
     @api.response(
         200, model=raw_config_schema, description='Flexget raw YAML config file encoded in Base64'
     )
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """Get raw YAML config file"""
         with open(self.manager.config_path, 'r', encoding='utf-8') as f:
             raw_config = base64.b64encode(f.read().encode("utf-8"))
@@ -204,7 +203,7 @@ class ServerRawConfigAPI(APIResource):
         description='Config file must be base64 encoded. A backup will be created, and if successful config will'
         ' be loaded and saved to original file.'
     )
-    def post(self, session: Session = None) -> Response:
+    def post(self) -> Response:
         """Update config"""
         config = {}
         data = request.json
@@ -260,9 +259,9 @@ class ServerRawConfigAPI(APIResource):
     description='In case of a request error when fetching latest flexget version, '
     'that value will return as null'
 )
-class ServerVersionAPI(APIResource):
+class ServerVersionAPI(SessionlessAPIResource):
     @api.response(200, description='Flexget version', model=version_schema)
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """Flexget Version"""
         latest = get_latest_flexget_version_number()
         return jsonify(
@@ -275,9 +274,9 @@ class ServerVersionAPI(APIResource):
 
 
 @server_api.route('/dump_threads/', doc=False)
-class ServerDumpThreads(APIResource):
+class ServerDumpThreads(SessionlessAPIResource):
     @api.response(200, description='Flexget threads dump', model=dump_threads_schema)
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """Dump Server threads for debugging"""
         id2name = dict([(th.ident, th.name) for th in threading.enumerate()])
         threads = []
@@ -335,23 +334,17 @@ def reverse_readline(
 
 
 def file_inode(filename: str) -> int:
-    fd = None
     try:
-        fd = os.open(filename, os.O_RDONLY)
-        inode = os.fstat(fd).st_ino
-        return inode
+        return os.stat(filename).st_ino
     except OSError:
         return 0
-    finally:
-        if fd:
-            os.close(fd)
 
 
 @server_api.route('/log/')
-class ServerLogAPI(APIResource):
+class ServerLogAPI(SessionlessAPIResource):
     @api.doc(parser=server_log_parser)
     @api.response(200, description='Streams as line delimited JSON')
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """Stream Flexget log Streams as line delimited JSON"""
         args = server_log_parser.parse_args()
 
@@ -361,20 +354,15 @@ class ServerLogAPI(APIResource):
 
             lines_found = []
 
-            if os.path.isabs(self.manager.options.logfile):
-                base_log_file = self.manager.options.logfile
-            else:
-                base_log_file = os.path.join(
-                    self.manager.config_base, self.manager.options.logfile
-                )
+            # Resolved once by the manager when logging was set up
+            base_log_file = self.manager.log_filename
 
             yield '{"stream": ['  # Start of the json stream
 
             # Read back in the logs until we find enough lines
             for i in range(0, 9):
-                log_file = ('%s.%s' % (base_log_file, i)).rstrip(
-                    '.0'
-                )  # 1st log file has no number
+                # 1st log file has no number
+                log_file = f'{base_log_file}.{i}' if i else base_log_file
 
                 if not os.path.isfile(log_file):
                     break
@@ -400,39 +388,89 @@ class ServerLogAPI(APIResource):
 
             # We need to track the inode in case the log file is rotated
             current_inode = file_inode(base_log_file)
+            fh = None
 
-            while True:
-                # If the server is shutting down then end the stream nicely
-                if cherrypy.engine.state != cherrypy.engine.states.STARTED:
-                    break
+            try:
+                while True:
+                    # If the server is shutting down then end the stream nicely
+                    if cherrypy.engine.state != cherrypy.engine.states.STARTED:
+                        break
 
-                new_inode = file_inode(base_log_file)
-                if current_inode != new_inode:
-                    # File updated/rotated. Read from beginning
-                    stream_from_byte = 0
-                    current_inode = new_inode
+                    new_inode = file_inode(base_log_file)
+                    if current_inode != new_inode:
+                        # File updated/rotated. Read from beginning
+                        stream_from_byte = 0
+                        current_inode = new_inode
+                        if fh:
+                            fh.close()
+                            fh = None
+
+                    try:
+                        if fh is None:
+                            fh = open(base_log_file, 'rb')
+                            fh.seek(stream_from_byte)
+                        new_lines = fh.readlines()
+                    except OSError:
+                        if fh:
+                            fh.close()
+                            fh = None
+                        yield '{},\n'
+                        sleep(2)
+                        continue
+
+                    if new_lines and not new_lines[-1].endswith(b'\n'):
+                        # The last line is still being written, read it again on the next pass
+                        fh.seek(-len(new_lines.pop()), os.SEEK_CUR)
+                    stream_from_byte = fh.tell()
+
+                    matched = False
+                    for line in new_lines:
+                        line = line.decode(sys.getfilesystemencoding())
+                        if log_parser.matches(line):
+                            matched = True
+                            yield log_parser.json_string(line) + ',\n'
+
+                    if not matched:
+                        # Keep the stream alive, this is also how a closed connection is noticed
+                        yield '{},\n'
+                    if not new_lines:
+                        # Only wait when the file has nothing new, rather than after every line
+                        sleep(2)
+            finally:
+                if fh:
+                    fh.close()
 
-                try:
-                    with open(base_log_file, 'rb') as fh:
-                        fh.seek(stream_from_byte)
-                        line = fh.readline().decode(sys.getfilesystemencoding())
-                        stream_from_byte = fh.tell()
-                except OSError:
-                    yield '{}'
-                    continue
+            yield '{}]}'  # End of stream
 
-                # If a valid line is found and does not pass the filter then set it to none
-                line = log_parser.json_string(line) if log_parser.matches(line) else '{}'
+        return Response(follow(args['lines'], args['search']), mimetype='text/event-stream')
 
-                if line == '{}':
-                    # If no match then delay to prevent many read hits on the file
-                    sleep(2)
 
-                yield line + ',\n'
+def _build_log_line_parser():
+    time_cmpnt = Word(nums).setParseAction(lambda t: t[0].zfill(2))
+    date = Combine(
+        (time_cmpnt + '-' + time_cmpnt + '-' + time_cmpnt)
+        + ' '
+        + time_cmpnt
+        + ':'
+        + time_cmpnt
+        + Optional(':' + time_cmpnt)
+    )
+    word = Word(printables)
+
+    return (
+        date.setResultsName('timestamp')
+        + word.setResultsName('log_level')
+        + word.setResultsName('plugin')
+        + (
+            White(min=16).setParseAction(lambda s, l, t: [t[0].strip()]).setResultsName('task')
+            | (White(min=1).suppress() & word.setResultsName('task'))
+        )
+        + restOfLine.setResultsName('message')
+    ).streamline()
 
-            yield '{}]}'  # End of stream
 
-        return Response(follow(args['lines'], args['search']), mimetype='text/event-stream')
+# The log line grammar is the same for every stream, only the search query differs
+_log_line_parser = _build_log_line_parser()
 
 
 class LogParser:
@@ -506,28 +544,6 @@ class LogParser:
         else:
             self._query_parser = False
 
-        time_cmpnt = Word(nums).setParseAction(lambda t: t[0].zfill(2))
-        date = Combine(
-            (time_cmpnt + '-' + time_cmpnt + '-' + time_cmpnt)
-            + ' '
-            + time_cmpnt
-            + ':'
-            + time_cmpnt
-            + Optional(':' + time_cmpnt)
-        )
-        word = Word(printables)
-
-        self._log_parser = (
-            date.setResultsName('timestamp')
-            + word.setResultsName('log_level')
-            + word.setResultsName('plugin')
-            + (
-                White(min=16).setParseAction(lambda s, l, t: [t[0].strip()]).setResultsName('task')
-                | (White(min=1).suppress() & word.setResultsName('task'))
-            )
-            + restOfLine.setResultsName('message')
-        )
-
     def evaluate_and(self, argument):
         return self.evaluate(argument[0]) and self.evaluate(argument[1])
 
@@ -563,15 +579,15 @@ class LogParser:
 
     def json_string(self, line):
         try:
-            return json.dumps(self._log_parser().parseString(line).asDict())
+            return json.dumps(_log_line_parser.parseString(line).asDict())
         except ParseException:
             return '{}'
 
 
 @server_api.route('/crash_logs/')
-class ServerCrashLogAPI(APIResource):
+class ServerCrashLogAPI(SessionlessAPIResource):
     @api.response(200, 'Succesfully retreived crash logs', model=crash_logs_schema)
-    def get(self, session: Session):
+    def get(self):
         """Get Crash logs"""
         path = Path(self.manager.config_base)
         crashes = [
@@ -8,19 +8,18 @@ from typing import TYPE_CHECKING, Any, Dict
 
 from flask import Response, jsonify, request
 from flask_restx import inputs
-from sqlalchemy.orm import Session
 
-from flexget.api import APIResource, api
+from flexget.api import SessionlessAPIResource, api
 from flexget.api.app import (
     APIError,
     BadRequest,
     Conflict,
     NotFoundError,
     base_message_schema,
+    compiled_schema,
     etag,
     success_response,
 )
-from flexget.config_schema import process_config
 from flexget.entry import Entry
 from flexget.event import event
 from flexget.log import capture_logs
@@ -173,6 +172,9 @@ class ObjectsContainer:
 tasks_list_schema = api.schema_model('tasks.list', ObjectsContainer.tasks_list_object)
 task_input_schema = api.schema_model('tasks.task', ObjectsContainer.task_input_object)
 task_return_schema = api.schema_model('tasks.task', ObjectsContainer.task_return_object)
+# The validators filling in config defaults, bound at import so compile_schemas() preloads them
+task_input_validator = compiled_schema(task_input_schema, set_defaults=True)
+task_return_validator = compiled_schema(task_return_schema, set_defaults=True)
 task_api_queue_schema = api.schema_model('task.queue', ObjectsContainer.task_queue_schema)
 task_api_execute_schema = api.schema_model(
     'task.execution', ObjectsContainer.task_execution_results_schema
@@ -194,13 +196,18 @@ tasks_parser.add_argument(
 )
 
 
+def _copy_json(data: Any) -> Any:
+    """Returns a deep copy of the json `data`, for which a json round trip is a cheap deep copy."""
+    return json.loads(json.dumps(data))
+
+
 @tasks_api.route('/')
 @api.doc(description=task_api_desc)
-class TasksAPI(APIResource):
+class TasksAPI(SessionlessAPIResource):
     @etag
     @api.response(200, model=tasks_list_schema)
     @api.doc(parser=tasks_parser)
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """List all tasks"""
 
         active_tasks = {
@@ -220,34 +227,30 @@ class TasksAPI(APIResource):
     @api.response(201, description='Newly created task', model=task_return_schema)
     @api.response(Conflict)
     @api.response(APIError)
-    def post(self, session: Session = None) -> Response:
+    def post(self) -> Response:
         """Add new task"""
         data = request.json
 
         task_name = data['name']
 
-        if task_name in self.manager.user_config.get('tasks', {}):
-            raise Conflict('task already exists')
+        user_tasks = self.manager.user_config.setdefault('tasks', {})
+        config_tasks = self.manager.config.setdefault('tasks', {})
 
-        if 'tasks' not in self.manager.user_config:
-            self.manager.user_config['tasks'] = {}
-        if 'tasks' not in self.manager.config:
-            self.manager.config['tasks'] = {}
+        if task_name in user_tasks:
+            raise Conflict('task already exists')
 
-        task_schema_processed = copy.deepcopy(data)
-        errors = process_config(
-            task_schema_processed, schema=task_input_schema.__schema__, set_defaults=True
-        )
+        task_schema_processed = _copy_json(data)
+        errors = task_input_validator.process(task_schema_processed)
 
         if errors:
             raise APIError('problem loading config, raise a BUG as this should not happen!')
 
-        self.manager.user_config['tasks'][task_name] = data['config']
-        self.manager.config['tasks'][task_name] = task_schema_processed['config']
+        user_tasks[task_name] = data['config']
+        config_tasks[task_name] = task_schema_processed['config']
 
         self.manager.save_config()
         self.manager.config_changed()
-        rsp = jsonify({'name': task_name, 'config': self.manager.user_config['tasks'][task_name]})
+        rsp = jsonify({'name': task_name, 'config': user_tasks[task_name]})
         rsp.status_code = 201
         return rsp
 
@@ -255,67 +258,63 @@ class TasksAPI(APIResource):
 @tasks_api.route('/<task>/')
 @api.doc(params={'task': 'task name'}, description=task_api_desc)
 @api.response(APIError, description='unable to read config')
-class TaskAPI(APIResource):
+class TaskAPI(SessionlessAPIResource):
     @etag
     @api.response(200, model=task_return_schema)
     @api.response(NotFoundError, description='task not found')
-    def get(self, task, session: Session = None) -> Response:
+    def get(self, task) -> Response:
         """Get task config"""
-        if task not in self.manager.user_config.get('tasks', {}):
+        user_tasks = self.manager.user_config.get('tasks', {})
+        if task not in user_tasks:
             raise NotFoundError(f'task `{task}` not found')
 
-        return jsonify({'name': task, 'config': self.manager.user_config['tasks'][task]})
+        return jsonify({'name': task, 'config': user_tasks[task]})
 
     @api.validate(task_input_schema)
     @api.response(200, model=task_return_schema)
     @api.response(NotFoundError)
     @api.response(BadRequest)
-    def put(self, task, session: Session = None) -> Response:
+    def put(self, task) -> Response:
         """Update tasks config"""
         data = request.json
 
         new_task_name = data['name']
 
-        if task not in self.manager.user_config.get('tasks', {}):
+        # Looked up without setdefault, so a missing task does not leave an empty `tasks` in the config
+        user_tasks = self.manager.user_config.get('tasks', {})
+        if task not in user_tasks:
             raise NotFoundError(f'task `{task}` not found')
 
-        if 'tasks' not in self.manager.user_config:
-            self.manager.user_config['tasks'] = {}
-        if 'tasks' not in self.manager.config:
-            self.manager.config['tasks'] = {}
+        config_tasks = self.manager.config.setdefault('tasks', {})
 
         if task != new_task_name:
             # Rename task
-            if new_task_name in self.manager.user_config['tasks']:
+            if new_task_name in user_tasks:
                 raise BadRequest('cannot rename task as it already exist')
 
-            del self.manager.user_config['tasks'][task]
-            del self.manager.config['tasks'][task]
+            del user_tasks[task]
+            del config_tasks[task]
 
         # Process the task config
-        task_schema_processed = copy.deepcopy(data)
-        errors = process_config(
-            task_schema_processed, schema=task_return_schema.__schema__, set_defaults=True
-        )
+        task_schema_processed = _copy_json(data)
+        errors = task_return_validator.process(task_schema_processed)
 
         if errors:
             raise APIError('problem loading config, raise a BUG as this should not happen!')
 
-        self.manager.user_config['tasks'][new_task_name] = data['config']
-        self.manager.config['tasks'][new_task_name] = task_schema_processed['config']
+        user_tasks[new_task_name] = data['config']
+        config_tasks[new_task_name] = task_schema_processed['config']
 
         self.manager.save_config()
         self.manager.config_changed()
 
-        rsp = jsonify(
-            {'name': new_task_name, 'config': self.manager.user_config['tasks'][new_task_name]}
-        )
+        rsp = jsonify({'name': new_task_name, 'config': user_tasks[new_task_name]})
         rsp.status_code = 200
         return rsp
 
     @api.response(200, model=base_message_schema, description='deleted task')
     @api.response(NotFoundError)
-    def delete(self, task, session: Session = None) -> Response:
+    def delete(self, task) -> Response:
         """Delete a task"""
         try:
             self.manager.config['tasks'].pop(task)
@@ -328,7 +327,9 @@ class TaskAPI(APIResource):
         return success_response('successfully deleted task')
 
 
-default_start_date = (datetime.now() - timedelta(weeks=1)).strftime('%Y-%m-%d')
+def default_start_date() -> str:
+    return (datetime.now() - timedelta(weeks=1)).strftime('%Y-%m-%d')
+
 
 status_parser = api.parser()
 status_parser.add_argument(
@@ -370,9 +371,9 @@ def _task_info_dict(task):
 
 
 @tasks_api.route('/queue/')
-class TaskQueueAPI(APIResource):
+class TaskQueueAPI(SessionlessAPIResource):
     @api.response(200, model=task_api_queue_schema)
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """List task(s) in queue for execution"""
         tasks = [_task_info_dict(task) for task in self.manager.task_queue.run_queue.queue]
 
@@ -405,10 +406,10 @@ inject_api = api.namespace('inject', description='Entry injection API')
 @inject_api.route('/params/')
 @tasks_api.route('/execute/params/')
 @api.doc(description='Available payload parameters for task execute')
-class TaskExecutionParams(APIResource):
+class TaskExecutionParams(SessionlessAPIResource):
     @etag(cache_age=3600)
     @api.response(200, model=task_execution_params)
-    def get(self, session: Session = None) -> Response:
+    def get(self) -> Response:
         """Execute payload parameters"""
         return jsonify(ObjectsContainer.task_execution_input)
 
@@ -416,18 +417,17 @@ class TaskExecutionParams(APIResource):
 @inject_api.route('/')
 @tasks_api.route('/execute/')
 @api.doc(description='For details on available parameters query /params/ endpoint')
-class TaskExecutionAPI(APIResource):
+class TaskExecutionAPI(SessionlessAPIResource):
     @api.response(NotFoundError)
     @api.response(BadRequest)
     @api.response(200, model=task_api_execute_schema)
     @api.validate(task_execution_schema)
-    def post(self, session: Session = None) -> Response:
+    def post(self) -> Response:
         """Execute task and stream results"""
         data = request.json
+        existing_tasks = {t.lower() for t in self.manager.user_config.get('tasks', {})}
         for task in data.get('tasks'):
-            if task.lower() not in [
-                t.lower() for t in self.manager.user_config.get('tasks', {}).keys()
-            ]:
+            if task.lower() not in existing_tasks:
                 raise NotFoundError(f'task {task} does not exist')
 
         queue = ExecuteLog()
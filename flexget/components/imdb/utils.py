@@ -1,17 +1,37 @@
 import difflib
-import json
 import random
 import re
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 
+from bs4 import SoupStrainer
 from loguru import logger
 
 from flexget import plugin
+from flexget.utils import json
 from flexget.utils.requests import Session, TimedLimiter
 from flexget.utils.soup import get_soup
 from flexget.utils.tools import str_to_int
 
 logger = logger.bind(name='imdb.utils')
+
+IMDB_URL_RE = re.compile(r'https?://[^/]*imdb\.com/')
+IMDB_TITLE_URL_RE = re.compile(r'.*\.imdb\.com/title/tt\d+/')
+# IMDB IDs for titles have 'tt' followed by 7 or 8 digits
+TITLE_ID_RE = re.compile(r'tt\d{7,8}')
+# An IMDB ID for a person is formed by 'nm' followed by 7 or 8 digits
+PERSON_ID_RE = re.compile(r'nm\d{7,8}')
+ANY_ID_RE = re.compile(r'((?:nm|tt)\d{7,8})')
+# Search result details, e.g. "(2001) (TV Movie)"
+PARENS_RE = re.compile(r'\((.*?)\)')
+YEAR_RE = re.compile(r'^\d{4}$')
+AKA_RE = re.compile(r'".*"')
+# Everything ImdbParser needs is in the title page's two embedded JSON documents
+LD_JSON_RE = re.compile(rb'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>', re.S)
+PROPS_JSON_RE = re.compile(rb'<script[^>]*type="application/json"[^>]*>(.*?)</script>', re.S)
+
 # IMDb delivers a version of the page which is unparsable to unknown (and some known) user agents, such as requests'
 # Spoof the old urllib user agent to keep results consistent
 requests = Session()
@@ -33,7 +53,7 @@ def is_imdb_url(url):
     if not isinstance(url, str):
         return
     # Probably should use urlparse.
-    return re.match(r'https?://[^/]*imdb\.com/', url)
+    return IMDB_URL_RE.match(url)
 
 
 def is_valid_imdb_title_id(value):
@@ -42,8 +62,7 @@ def is_valid_imdb_title_id(value):
     """
     if not isinstance(value, str):
         raise TypeError("is_valid_imdb_title_id expects a string but got {0}".format(type(value)))
-    # IMDB IDs for titles have 'tt' followed by 7 or 8 digits
-    return re.match(r'tt\d{7,8}', value) is not None
+    return TITLE_ID_RE.match(value) is not None
 
 
 def is_valid_imdb_person_id(value):
@@ -52,15 +71,14 @@ def is_valid_imdb_person_id(value):
     """
     if not isinstance(value, str):
         raise TypeError("is_valid_imdb_person_id expects a string but got {0}".format(type(value)))
-    # An IMDB ID for a person is formed by 'nm' followed by 7 digits
-    return re.match(r'nm\d{7,8}', value) is not None
+    return PERSON_ID_RE.match(value) is not None
 
 
 def extract_id(url):
     """Return IMDb ID of the given URL. Return None if not valid or if URL is not a string."""
     if not isinstance(url, str):
         return
-    m = re.search(r'((?:nm|tt)\d{7,8})', url)
+    m = ANY_ID_RE.search(url)
     if m:
         return m.group(1)
 
@@ -70,6 +88,11 @@ def make_url(imdb_id):
     return 'https://www.imdb.com/title/%s/' % imdb_id
 
 
+@lru_cache()
+def _ireplace_pattern(old):
+    return re.compile(re.escape(old), re.I)
+
+
 class ImdbSearch:
     def __init__(self):
         # de-prioritize aka matches a bit
@@ -84,8 +107,7 @@ class ImdbSearch:
 
     def ireplace(self, text, old, new, count=0):
         """Case insensitive string replace"""
-        pattern = re.compile(re.escape(old), re.I)
-        return re.sub(pattern, new, text, count)
+        return _ireplace_pattern(old).sub(new, text, count)
 
     def smart_match(self, raw_name, single_match=True):
         """Accepts messy name, cleans it and uses information available to make smartest and best match"""
@@ -100,16 +122,18 @@ class ImdbSearch:
 
     def best_match(self, name, year=None, single_match=True):
         """Return single movie that best matches name criteria or None"""
-        movies = self.search(name)
+        movies = self.search(name, min_match=self.min_match)
 
         if not movies:
             logger.debug('search did not return any movies')
             return None
 
         # remove all movies below min_match, and different year
+        remaining = []
         exact = []
+        name_lower = name.lower()
 
-        for movie in movies[:]:
+        for movie in movies:
             if year and movie.get('year'):
                 if movie['year'] != year:
                     logger.debug(
@@ -118,15 +142,15 @@ class ImdbSearch:
                         movie['url'],
                         str(movie['year']),
                     )
-                    movies.remove(movie)
                     continue
                 # Look for exact match
-                if movie['year'] == year and movie['name'].lower() == name.lower():
+                if movie['name'].lower() == name_lower:
                     exact.append(movie)
             if movie['match'] < self.min_match:
                 logger.debug('best_match removing {} (min_match)', movie['name'])
-                movies.remove(movie)
                 continue
+            remaining.append(movie)
+        movies = remaining
 
         if not movies:
             logger.debug('FAILURE: no movies remain')
@@ -156,8 +180,13 @@ class ImdbSearch:
         else:
             return movies[0] if single_match else movies
 
-    def search(self, name):
-        """Return array of movie details (dict)"""
+    def search(self, name, min_match=None):
+        """
+        Return array of movie details (dict)
+
+        :param min_match: If given, the match ratio of movies which cannot reach it is not calculated
+          exactly. They get a lower ratio instead.
+        """
         logger.debug('Searching: {}', name)
         url = 'https://www.imdb.com/find'
         # This may include Shorts and TV series in the results
@@ -168,14 +197,13 @@ class ImdbSearch:
         actual_url = page.url
 
         movies = []
-        soup = get_soup(page.text)
         # in case we got redirected to movie page (perfect match)
-        re_m = re.match(r'.*\.imdb\.com/title/tt\d+/', actual_url)
+        re_m = IMDB_TITLE_URL_RE.match(actual_url)
         if re_m:
             actual_url = re_m.group(0)
             imdb_id = extract_id(actual_url)
             movie_parse = ImdbParser()
-            movie_parse.parse(imdb_id, soup=soup)
+            movie_parse.parse(imdb_id, content=page.content)
             logger.debug('Perfect hit. Search got redirected to {}', actual_url)
             movie = {
                 'match': 1.0,
@@ -187,6 +215,10 @@ class ImdbSearch:
             movies.append(movie)
             return movies
 
+        # Only the results table is used, so don't build a tree for the rest of the (large) page
+        soup = get_soup(
+            page.text, parser='html.parser', parse_only=SoupStrainer('table', class_='findList')
+        )
         section_table = soup.find('table', 'findList')
         if not section_table:
             logger.debug('results table not found')
@@ -195,21 +227,38 @@ class ImdbSearch:
         rows = section_table.find_all('tr')
         if not rows:
             logger.debug('Titles section does not have links')
+        name_title = name.title()
+        # The searched name is the same for every comparison, set it as the second sequence
+        # so difflib only has to analyze it once and reuse the matcher for all candidates
+        seq = difflib.SequenceMatcher(lambda x: x == ' ', b=name_title)
+        # Ratios are multiplied by at most first_weight, anything below this can never reach min_match
+        ratio_cutoff = min_match / self.first_weight if min_match else 0
+
+        def match_ratio(title):
+            seq.set_seq1(title)
+            # Check the cheap upper bounds before doing the expensive full comparison
+            if seq.real_quick_ratio() < ratio_cutoff or seq.quick_ratio() < ratio_cutoff:
+                return 0.0
+            return seq.ratio()
+
         for count, row in enumerate(rows):
             # Title search gives a lot of results, only check the first ones
             if count > self.max_results:
                 break
 
             result_text = row.find('td', 'result_text')
+            # .text walks the whole cell each time it is accessed
+            result_text_str = result_text.text
             movie = {}
-            additional = re.findall(r'\((.*?)\)', result_text.text)
+            # Only the last two details are used, e.g. "(2001) (TV Movie)"
+            additional = [m.group(1) for m in deque(PARENS_RE.finditer(result_text_str), maxlen=2)]
             if len(additional) > 0:
-                if re.match(r'^\d{4}$', additional[-1]):
+                if YEAR_RE.match(additional[-1]):
                     movie['year'] = str_to_int(additional[-1])
                 elif len(additional) > 1:
                     movie['year'] = str_to_int(additional[-2])
                     if additional[-1] not in ['TV Movie', 'Video']:
-                        logger.debug('skipping {}', result_text.text)
+                        logger.debug('skipping {}', result_text_str)
                         continue
             primary_photo = row.find('td', 'primary_photo')
             movie['thumbnail'] = primary_photo.find('a').find('img').get('src')
@@ -221,29 +270,32 @@ class ImdbSearch:
             logger.debug('processing name: {} url: {}', movie['name'], movie['url'])
 
             # calc & set best matching ratio
-            seq = difflib.SequenceMatcher(lambda x: x == ' ', movie['name'].title(), name.title())
-            ratio = seq.ratio()
-
-            # check if some of the akas have better ratio
-            for aka in link.parent.find_all('i'):
-                aka = aka.next.string
-                match = re.search(r'".*"', aka)
-                if not match:
-                    logger.debug('aka `{}` is invalid', aka)
-                    continue
-                aka = match.group(0).replace('"', '')
-                logger.trace('processing aka {}', aka)
-                seq = difflib.SequenceMatcher(lambda x: x == ' ', aka.title(), name.title())
-                aka_ratio = seq.ratio()
-                if aka_ratio > ratio:
-                    ratio = aka_ratio * self.aka_weight
-                    logger.debug(
-                        '- aka `{}` matches better to `{}` ratio {} (weighted to {})',
-                        aka,
-                        name,
-                        aka_ratio,
-                        ratio,
-                    )
+            movie_title = movie['name'].title()
+            if movie_title == name_title:
+                # exact title match, neither fuzzy matching nor the akas can do any better
+                ratio = 1.0
+            else:
+                ratio = match_ratio(movie_title)
+
+                # check if some of the akas have better ratio
+                for aka in result_text.find_all('i'):
+                    aka = aka.get_text()
+                    match = AKA_RE.search(aka)
+                    if not match:
+                        logger.debug('aka `{}` is invalid', aka)
+                        continue
+                    aka = match.group(0).replace('"', '')
+                    logger.trace('processing aka {}', aka)
+                    aka_ratio = match_ratio(aka.title())
+                    if aka_ratio > ratio:
+                        ratio = aka_ratio * self.aka_weight
+                        logger.debug(
+                            '- aka `{}` matches better to `{}` ratio {} (weighted to {})',
+                            aka,
+                            name,
+                            aka_ratio,
+                            ratio,
+                        )
 
             # prioritize items by position
             position_ratio = (self.first_weight - 1) / (count + 1) + 1
@@ -256,10 +308,32 @@ class ImdbSearch:
             movie['match'] = ratio
             movies.append(movie)
 
-        movies.sort(key=lambda x: x['match'], reverse=True)
+        movies.sort(key=itemgetter('match'), reverse=True)
         return movies
 
 
+def _script_json(script_re, content):
+    """Return the decoded contents of the first script tag matched by `script_re` or None"""
+    # Searching the raw bytes saves decoding the whole page to text, json reads bytes directly
+    match = script_re.search(content)
+    if match:
+        return json.loads(match.group(1))
+
+
+def _dig(obj, *keys, default=None):
+    """
+    Return the value at the path `keys` of nested dicts, or `default` if any part of it is missing.
+
+    Fields which do not exist are usually present with a null value in the imdb data, so those
+    are treated the same as missing keys.
+    """
+    for key in keys:
+        if not obj:
+            return default
+        obj = obj.get(key)
+    return default if obj is None else obj
+
+
 class ImdbParser:
     """Quick-hack to parse relevant imdb details"""
 
@@ -285,56 +359,44 @@ class ImdbParser:
     def __str__(self):
         return '<ImdbParser(name=%s,imdb_id=%s)>' % (self.name, self.imdb_id)
 
-    def parse(self, imdb_id, soup=None):
+    def parse(self, imdb_id, content=None):
         self.imdb_id = extract_id(imdb_id)
         url = make_url(self.imdb_id)
         self.url = url
 
-        if not soup:
+        if not content:
             page = requests.get(url)
-            soup = get_soup(page.text)
+            content = page.content
 
-        data = json.loads(soup.find('script', {'type': 'application/ld+json'}).string)
+        data = _script_json(LD_JSON_RE, content)
         if not data:
             raise plugin.PluginError(
                 'IMDB parser needs updating, imdb format changed. Please report on Github.'
             )
 
-        props_data = json.loads(soup.find('script', {'type': 'application/json'}).string)
-        if (
-            not props_data
-            or not props_data.get('props')
-            or not props_data.get('props').get('pageProps')
-        ):
+        page_props = _dig(_script_json(PROPS_JSON_RE, content), 'props', 'pageProps')
+        if not page_props:
             raise plugin.PluginError(
                 'IMDB parser needs updating, imdb props_data format changed. Please report on Github.'
             )
 
-        above_the_fold_data = props_data['props']['pageProps'].get('aboveTheFoldData')
+        above_the_fold_data = page_props.get('aboveTheFoldData')
         if not above_the_fold_data:
             raise plugin.PluginError(
                 'IMDB parser needs updating, imdb above_the_fold_data format changed. Please report on Github.'
             )
 
-        title = above_the_fold_data.get('titleText')
-        if title:
-            self.name = title.get('text')
+        self.name = _dig(above_the_fold_data, 'titleText', 'text')
         if not self.name:
             raise plugin.PluginError(
                 'IMDB parser needs updating, imdb above_the_fold_data format changed for title. Please report on Github.'
             )
 
-        original_name = above_the_fold_data.get('originalTitleText')
-        if original_name:
-            self.original_name = original_name.get('text')
-
+        self.original_name = _dig(above_the_fold_data, 'originalTitleText', 'text')
         if not self.original_name:
             logger.debug('No original title found for {}', self.imdb_id)
 
-        # NOTE: We cannot use the get default approach here .(get(x, {}))
-        # as the data returned in imdb has all fields with null values if they do not exist.
-        if above_the_fold_data.get('releaseYear'):
-            self.year = above_the_fold_data['releaseYear'].get('year')
+        self.year = _dig(above_the_fold_data, 'releaseYear', 'year', default=0)
         if not self.year:
             logger.debug('No year found for {}', self.imdb_id)
 
@@ -362,11 +424,7 @@ class ImdbParser:
             else:
                 logger.debug('No score found for {}', self.imdb_id)
 
-        meta_critic = above_the_fold_data.get('metacritic')
-        if meta_critic:
-            meta_score = meta_critic.get('metascore')
-            if meta_score:
-                self.meta_score = meta_score.get('score')
+        self.meta_score = _dig(above_the_fold_data, 'metacritic', 'metascore', 'score', default=0)
         if not self.meta_score:
             logger.debug('No Metacritic score found for {}', self.imdb_id)
 
@@ -375,73 +433,63 @@ class ImdbParser:
         if not isinstance(directors, list):
             directors = [directors]
 
-        for director in directors:
-            if director['@type'] != 'Person':
-                continue
-            director_id = extract_id(director['url'])
-            director_name = director['name']
-            self.directors[director_id] = director_name
+        self.directors = {
+            extract_id(director['url']): director['name']
+            for director in directors
+            if director['@type'] == 'Person'
+        }
 
         # get writer(s)
         writers = data.get('creator', [])
         if not isinstance(writers, list):
             writers = [writers]
 
-        for writer in writers:
-            if writer['@type'] != 'Person':
-                continue
-            writer_id = extract_id(writer['url'])
-            writer_name = writer['name']
-            self.writers[writer_id] = writer_name
+        self.writers = {
+            extract_id(writer['url']): writer['name']
+            for writer in writers
+            if writer['@type'] == 'Person'
+        }
 
         # Details section
-        main_column_data = props_data['props']['pageProps'].get('mainColumnData')
+        main_column_data = page_props.get('mainColumnData')
         if not main_column_data:
             raise plugin.PluginError(
                 'IMDB parser needs updating, imdb main_column_data format changed. Please report on Github.'
             )
 
-        for language in (main_column_data.get('spokenLanguages') or {}).get('spokenLanguages', []):
+        for language in _dig(main_column_data, 'spokenLanguages', 'spokenLanguages', default=[]):
             self.languages.append(language['text'].lower())
 
         # Storyline section
-        # NOTE: We cannot use the get default approach here .(get(x, {}))
-        # as the data returned in imdb has all fields with null values if they do not exist.
-        summaries = main_column_data.get('summaries') or {}
-        summary_edges = summaries.get('edges') or []
-        if len(summary_edges) > 0:
-            edge_node = summary_edges[0].get('node') or {}
-            plot_text = edge_node.get('plotText') or {}
-            # Strip out html
-            plot_html = get_soup(plot_text.get('plaidHtml'))
+        summary_edges = _dig(main_column_data, 'summaries', 'edges')
+        if summary_edges:
+            plot_html = _dig(summary_edges[0], 'node', 'plotText', 'plaidHtml')
             if plot_html:
-                self.plot_outline = plot_html.text
+                # Strip out html
+                self.plot_outline = get_soup(plot_html).text
         if not self.plot_outline:
             logger.debug('No storyline found for {}', self.imdb_id)
 
-        storyline_keywords = main_column_data.get('storylineKeywords') or {}
-        for keyword_node in storyline_keywords.get('edges') or []:
-            keyword = keyword_node.get('node') or {}
+        for keyword_node in _dig(main_column_data, 'storylineKeywords', 'edges', default=[]):
+            keyword = _dig(keyword_node, 'node', 'text')
             if keyword:
-                self.plot_keywords.append(keyword.get('text').lower())
+                self.plot_keywords.append(keyword.lower())
 
-        genres = (above_the_fold_data.get('genres', {}) or {}).get('genres')
+        genres = _dig(above_the_fold_data, 'genres', 'genres', default=[])
         self.genres = [g['text'].lower() for g in genres]
 
         # Cast section
-        cast_data = main_column_data.get('cast', {}) or {}
-        for cast_node in cast_data.get('edges') or []:
-            actor_node = (cast_node.get('node') or {}).get('name') or {}
-            actor_id = actor_node.get('id')
-            actor_name = (actor_node.get('nameText') or {}).get('text')
-            if actor_id and actor_name:
-                self.actors[actor_id] = actor_name
-
-        principal_cast_data = main_column_data.get('principalCast', []) or []
+        actor_nodes = [
+            _dig(cast_node, 'node', 'name', default={})
+            for cast_node in _dig(main_column_data, 'cast', 'edges', default=[])
+        ]
+        principal_cast_data = main_column_data.get('principalCast')
         if principal_cast_data:
-            for cast_node in principal_cast_data[0].get('credits') or []:
-                actor_node = cast_node.get('name') or {}
-                actor_id = actor_node.get('id')
-                actor_name = (actor_node.get('nameText') or {}).get('text')
-                if actor_id and actor_name:
-                    self.actors[actor_id] = actor_name
+            actor_nodes.extend(
+                cast_node.get('name') or {}
+                for cast_node in principal_cast_data[0].get('credits') or []
+            )
+        actors = ((node.get('id'), _dig(node, 'nameText', 'text')) for node in actor_nodes)
+        self.actors = {
+            actor_id: actor_name for actor_id, actor_name in actors if actor_id and actor_name
+        }
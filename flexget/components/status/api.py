@@ -161,7 +161,9 @@ class TaskStatusAPI(APIResource):
         return jsonify(st_task)
 
 
-default_start_date = (datetime.now() - timedelta(weeks=1)).strftime('%Y-%m-%d')
+def default_start_date() -> str:
+    return (datetime.now() - timedelta(weeks=1)).strftime('%Y-%m-%d')
+
 
 executions_parser = api.parser()
 executions_parser.add_argument(
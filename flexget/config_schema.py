@@ -119,26 +119,40 @@ def resolve_ref(uri: str) -> JsonSchema:
     raise jsonschema.RefResolutionError("%s could not be resolved" % uri)
 
 
+def get_validator(
+    schema: Optional[JsonSchema] = None, set_defaults: bool = True
+) -> jsonschema.Draft4Validator:
+    """
+    Builds a validator for `schema`, which can be kept around and passed to :func:`process_config`
+    to avoid rebuilding it on every validation. If schema is not given, uses the root config schema.
+
+    :param set_defaults: Whether the validator should fill in defaults while validating.
+    """
+    if schema is None:
+        schema = get_schema()
+    resolver = RefResolver.from_schema(schema)
+    validator_class = DefaultsSchemaValidator if set_defaults else SchemaValidator
+    return validator_class(schema, resolver=resolver, format_checker=format_checker)
+
+
 def process_config(
-    config: Any, schema: Optional[JsonSchema] = None, set_defaults: bool = True
+    config: Any,
+    schema: Optional[JsonSchema] = None,
+    set_defaults: bool = True,
+    validator: Optional[jsonschema.Draft4Validator] = None,
 ) -> List[ConfigValidationError]:
     """
     Validates the config, and sets defaults within it if `set_defaults` is set.
     If schema is not given, uses the root config schema.
 
+    :param validator: A validator from :func:`get_validator` to use instead of building a new one.
+      `schema` and `set_defaults` are ignored when this is given.
     :returns: A list with :class:`jsonschema.ValidationError`s if any
 
     """
-    if schema is None:
-        schema = get_schema()
-    resolver = RefResolver.from_schema(schema)
-    validator = SchemaValidator(schema, resolver=resolver, format_checker=format_checker)
-    if set_defaults:
-        validator.VALIDATORS['properties'] = validate_properties_w_defaults
-    try:
-        errors: List[ValidationError] = list(validator.iter_errors(config))
-    finally:
-        validator.VALIDATORS['properties'] = jsonschema.Draft4Validator.VALIDATORS['properties']
+    if validator is None:
+        validator = get_validator(schema, set_defaults=set_defaults)
+    errors: List[ValidationError] = list(validator.iter_errors(config))
     # Customize the error messages
     for e in errors:
         set_error_message(e)
@@ -447,3 +461,6 @@ def validate_deprecated(validator, message, instance, schema):
 validators = {'anyOf': validate_anyOf, 'oneOf': validate_oneOf, 'deprecated': validate_deprecated}
 
 SchemaValidator = jsonschema.validators.extend(jsonschema.Draft4Validator, validators)
+DefaultsSchemaValidator = jsonschema.validators.extend(
+    SchemaValidator, {'properties': validate_properties_w_defaults}
+)
@@ -1,6 +1,7 @@
 from loguru import logger
 
 from flexget.api import api_app
+from flexget.api.app import compile_schemas
 from flexget.config_schema import register_config_key
 from flexget.event import event
 from flexget.ui.v1 import register_web_ui as register_web_ui_v1
@@ -101,6 +102,7 @@ def register_web_server(manager):
 
     logger.info("Initiating API")
     register_app('/api', api_app, 'API')
+    compile_schemas()
 
     # Register WebUI
     if web_server_config.get('web_ui'):
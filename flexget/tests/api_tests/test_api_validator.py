@@ -1,5 +1,13 @@
+import copy
 import json
 
+from flexget.api.app import compile_schemas
+from flexget.api.core.tasks import (
+    task_input_schema,
+    task_input_validator,
+    task_return_validator,
+)
+
 
 class TestValidator:
     config = '{tasks: {}}'
@@ -23,3 +31,21 @@ class TestValidator:
         assert 'The keys' in data['validation_errors'][0]['message']
         assert 'invalid_plugin' in data['validation_errors'][0]['message']
         assert 'fake_plugin2' in data['validation_errors'][0]['message']
+
+    def test_compiled_schemas(self, api_client):
+        # Compiling must not change the schemas, also not for validators which fill in defaults
+        schema = copy.deepcopy(task_input_schema.__schema__)
+        compile_schemas()
+        assert task_input_schema.__schema__ == schema
+
+        # The validators filling in defaults are preloaded before any request used them
+        for compiled in (task_input_validator, task_return_validator):
+            assert '/schema/plugins' in compiled.validator.resolver.store
+
+        new_task = {'name': 'new_task', 'config': {'mock': [{'title': 'entry 1'}]}}
+        rsp = api_client.json_post('/tasks/', data=json.dumps(new_task))
+        assert rsp.status_code == 201
+
+        new_task = {'name': 'new_task_2', 'config': {'invalid_plugin': {}}}
+        rsp = api_client.json_post('/tasks/', data=json.dumps(new_task))
+        assert rsp.status_code == 422
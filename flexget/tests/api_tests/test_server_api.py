@@ -7,6 +7,7 @@ import pytest
 from flexget import __version__
 from flexget.api.app import __version__ as __api_version__
 from flexget.api.app import base_message
+from flexget.api.core.server import LogParser
 from flexget.api.core.server import ObjectsContainer as OC
 from flexget.manager import Manager
 from flexget.tests.conftest import MockManager
@@ -129,3 +130,22 @@ class TestServerAPI:
         assert not errors
 
         assert len(data) == 2
+
+
+class TestLogParser:
+    line = '2022-01-01 10:01 INFO     manager       test_task       second line'
+
+    def test_json_string(self):
+        for parser in (LogParser(None), LogParser('second')):
+            assert json.loads(parser.json_string(self.line)) == {
+                'timestamp': '2022-01-01 10:01',
+                'log_level': 'INFO',
+                'plugin': 'manager',
+                'task': 'test_task',
+                'message': 'second line',
+            }
+
+    def test_matches(self):
+        assert LogParser('second').matches(self.line)
+        assert LogParser('"second line" and manager').matches(self.line)
+        assert not LogParser('first').matches(self.line)
@@ -147,6 +147,17 @@ class TestSchemaValidator:
         config_schema.process_config(config, schema)
         assert config["p"] == "foo"
 
+    def test_reused_validator(self):
+        schema = {"properties": {"p": {"default": 5}}}
+        validator = config_schema.get_validator(schema)
+        for _ in range(2):
+            config = {}
+            assert not config_schema.process_config(config, validator=validator)
+            assert config["p"] == 5
+        config = {}
+        config_schema.process_config(config, schema, set_defaults=False)
+        assert "p" not in config
+
 
 class TestSchemaFormats:
     def _test_format(self, format, items, invalid=False):
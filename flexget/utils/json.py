@@ -23,6 +23,11 @@ except ImportError:
         except ImportError:
             raise DependencyError(missing='simplejson')
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DATE_FMT = '%Y-%m-%d'
 ISO8601_FMT = '%Y-%m-%dT%H:%M:%SZ'
 
@@ -102,6 +107,10 @@ def loads(*args, **kwargs) -> Any:
         kwargs['object_hook'] = _datetime_decoder
         kwargs['cls'] = DTDecoder
     else:
+        if orjson and len(args) == 1 and not kwargs:
+            # orjson is a lot faster, but refuses some things json accepts (NaN, huge ints). Let json decide those.
+            with suppress(orjson.JSONDecodeError):
+                return orjson.loads(args[0])
         kwargs['object_hook'] = _empty_unicode_decoder
     return json.loads(*args, **kwargs)
 
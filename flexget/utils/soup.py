@@ -2,13 +2,16 @@
 # Based on html5lib code namespaceHTMLElements=False should do it, but nope ...
 # Also it doesn't seem to be available in older version from html5lib, removing it
 import warnings
-from typing import IO, Union
+from typing import IO, Optional, Union
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from html5lib.constants import DataLossWarning
 
 warnings.simplefilter('ignore', DataLossWarning)
 
 
-def get_soup(obj: Union[str, IO, bytes], parser: str = 'html5lib') -> BeautifulSoup:
-    return BeautifulSoup(obj, parser)
+def get_soup(
+    obj: Union[str, IO, bytes], parser: str = 'html5lib', parse_only: Optional[SoupStrainer] = None
+) -> BeautifulSoup:
+    # Note that html5lib ignores parse_only and always builds the whole tree
+    return BeautifulSoup(obj, parser, parse_only=parse_only)
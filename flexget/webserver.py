@@ -1,5 +1,5 @@
-import hashlib
 import random
+import secrets
 import socket
 import threading
 from typing import Dict, Optional, Tuple
@@ -26,7 +26,7 @@ rand = random.SystemRandom()
 
 def generate_key():
     """Generate key for use to authentication"""
-    return str(hashlib.sha224(str(rand.getrandbits(128)).encode('utf-8')).hexdigest())
+    return secrets.token_urlsafe(32)
 
 
 def get_random_string(